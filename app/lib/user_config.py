@@ -122,6 +122,11 @@ class _UserConfig:
 
     @property
     def max_moving_map_tracks(self) -> int:
+        """
+        Maximum number of track segments drawn on the moving map.
+        Old tracks are removed in chunks of up to 50 segments, so the trail
+        may briefly be shorter than this limit.
+        """
         return self.__get("max_moving_map_tracks", int, 5000)
 
     @max_moving_map_tracks.setter
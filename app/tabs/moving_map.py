@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import math
 import os
+from collections import deque
 from typing import Optional
 
 from bell.avr.mqtt.payloads import (
@@ -11,10 +12,9 @@ from bell.avr.mqtt.payloads import (
     AVRFCMGoToLocal,
     AVRFCMPositionLocal,
 )
-from PySide6 import QtCore, QtGui, QtSvgWidgets, QtWidgets
+from PySide6 import QtCore, QtGui, QtOpenGLWidgets, QtSvgWidgets, QtWidgets
 
 from app.lib.calc import constrain, normalize_value
-from app.lib.color import smear_color
 from app.lib.color_config import (
     BLACK_COLOR,
     ColorConfig,
@@ -69,10 +69,9 @@ class AttitudeIndicator(QtWidgets.QGraphicsView):
         self._roll = 0
         self._pitch = 0
 
-        self._face_delta_x_new = 0
-        self._face_delta_x_old = 0
-        self._face_delta_y_new = 0
-        self._face_delta_y_old = 0
+        # values last drawn, to skip re-drawing when nothing has changed
+        self._last_roll: Optional[float] = None
+        self._last_pitch: Optional[float] = None
 
         # constants
         self._original_width = 240
@@ -93,9 +92,14 @@ class AttitudeIndicator(QtWidgets.QGraphicsView):
         self.setStyleSheet("background: transparent; border: none")
         self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setViewportUpdateMode(
+            QtWidgets.QGraphicsView.ViewportUpdateMode.SmartViewportUpdate
+        )
 
         # create a graphics scene to draw on
         self._scene = QtWidgets.QGraphicsScene(self)
+        # nothing is ever looked up by position, so skip maintaining an index
+        self._scene.setItemIndexMethod(QtWidgets.QGraphicsScene.ItemIndexMethod.NoIndex)
         self.setScene(self._scene)
 
         self._scale_x = self.width() / self._original_width
@@ -144,6 +148,24 @@ class AttitudeIndicator(QtWidgets.QGraphicsView):
         self._item_case.setTransformOriginPoint(self._original_center)
         self._scene.addItem(self._item_case)
 
+        # resting position of the face at 0 pitch
+        self._face_home = self._item_face.pos()
+
+        # rotate the back, face and ring together as one item
+        self._rot_group = self._scene.createItemGroup(
+            [self._item_back, self._item_face, self._item_ring]
+        )
+        self._rot_group.setTransformOriginPoint(
+            self._original_center.x() * self._scale_x,
+            self._original_center.y() * self._scale_y,
+        )
+
+        # rasterize the static case once rather than on every repaint. The rotating
+        # items are left uncached so the SVG renderer keeps their edges antialiased
+        self._item_case.setCacheMode(
+            QtWidgets.QGraphicsItem.CacheMode.DeviceCoordinateCache
+        )
+
         # center on the middle of the scene
         self.centerOn(self.width() / 2, self.height() / 2)
         self._update_view()
@@ -153,8 +175,6 @@ class AttitudeIndicator(QtWidgets.QGraphicsView):
         Trigger a re-draw of the indicator.
         """
         self._update_view()
-        self._face_delta_x_old = self._face_delta_x_new
-        self._face_delta_y_old = self._face_delta_y_new
 
     def set_roll(self, roll: float) -> None:
         """
@@ -180,26 +200,24 @@ class AttitudeIndicator(QtWidgets.QGraphicsView):
         """
         Re-draw the indicator.
         """
+        if self._roll == self._last_roll and self._pitch == self._last_pitch:
+            return
+
         self._scale_x = self.width() / self._original_width
         self._scale_y = self.height() / self._original_height
 
-        self._item_back.setRotation(-self._roll)
-        self._item_ring.setRotation(-self._roll)
-        self._item_face.setRotation(-self._roll)
-
-        roll_rad = math.radians(self._roll)
-        delta = self._original_pizel_per_deg * self._pitch
-
-        self._face_delta_x_new = self._scale_x * delta * math.sin(roll_rad)
-        self._face_delta_y_new = self._scale_y * delta * math.cos(roll_rad)
+        self._rot_group.setRotation(-self._roll)
 
-        self._item_face.moveBy(
-            self._face_delta_x_new - self._face_delta_x_old,
-            self._face_delta_y_new - self._face_delta_y_old,
-        )
+        # the face is inside the rotated group, so pitch only ever moves it
+        # along the group's own vertical axis
+        face_delta_y = self._scale_y * self._original_pizel_per_deg * self._pitch
+        self._item_face.setPos(self._face_home.x(), self._face_home.y() + face_delta_y)
 
         self._scene.update()
 
+        self._last_roll = self._roll
+        self._last_pitch = self._pitch
+
 
 class DroneAltitudeWidget(QtWidgets.QWidget):
     GROUND_WIDTH = 3
@@ -218,6 +236,7 @@ class DroneAltitudeWidget(QtWidgets.QWidget):
         self.setLayout(layout)
 
         self.canvas = QtWidgets.QGraphicsScene(self)
+        self.canvas.setItemIndexMethod(QtWidgets.QGraphicsScene.ItemIndexMethod.NoIndex)
         self.view = QtWidgets.QGraphicsView(self.canvas)
         self.view.setSceneRect(
             0, 0, self.CANVAS_WIDTH, self.CANVAS_HEIGHT + self.GROUND_WIDTH
@@ -232,8 +251,23 @@ class DroneAltitudeWidget(QtWidgets.QWidget):
             self.DRONE_ICON_WIDTH,
             self.DRONE_ICON_HEIGHT,
         )
+        self.drone_icon.setCacheMode(
+            QtWidgets.QGraphicsItem.CacheMode.DeviceCoordinateCache
+        )
         self.canvas.addItem(self.drone_icon)
 
+        # the icon never changes size, so precompute the geometry used for placement
+        drone_icon_rect = self.drone_icon.boundingRect()
+        self._icon_w = drone_icon_rect.width()
+        self._icon_h = drone_icon_rect.height()
+        # horizontally centered on the canvas
+        self._icon_x = (self.CANVAS_WIDTH / 2) - (self._icon_w / 2)
+        # how tall the drone icon is visually. Qt still positions based on the bounding
+        # rectangle, even if it's being scaled
+        self._drone_visual_height = self._icon_h * self.drone_icon.base_scale
+        # difference between actual height and visual height
+        self._drone_bbox_fudge = (self._icon_h - self._drone_visual_height) / 2
+
         # add ground
         ground_pen = QtGui.QPen(
             QtGui.QColor(*ColorConfig.MOVING_MAP_GROUND_COLOR.rgb_255)
@@ -260,38 +294,36 @@ class DroneAltitudeWidget(QtWidgets.QWidget):
             QtWidgets.QSizePolicy.Policy.Fixed, QtWidgets.QSizePolicy.Policy.Fixed
         )
 
+        # altitude last drawn, to skip re-drawing when nothing has changed
+        self._last_altitude: Optional[float] = None
+
         # put drone on the ground
         self.set_altitude(0)
 
     def set_altitude(self, altitude: float) -> None:
+        if altitude == self._last_altitude:
+            return
+        self._last_altitude = altitude
+
         # flip because negative is up
         altitude *= -1
 
         # normalize value
         norm_altitude = normalize_value(altitude, 0, 20)
 
-        x = (self.CANVAS_WIDTH / 2) - (self.drone_icon.boundingRect().width() / 2)
-
         # half the width of the ground line, as half is drawn off-screen
         half_ground_width = self.GROUND_WIDTH / 2
         # usable canvas area taking out the vertical height occupied by the ground
         usable_canvas_height = self.CANVAS_HEIGHT - half_ground_width
-        # how tall the drone icon is visually. Qt still positions based on the bounding
-        # rectangle, even if it's being scaled
-        drone_visual_height = (
-            self.drone_icon.boundingRect().height() * self.drone_icon.base_scale
-        )
 
         y = (
             usable_canvas_height
             - (norm_altitude * usable_canvas_height)  # distance off the ground
-            - drone_visual_height  # visible height of the icon
-            - (
-                (self.drone_icon.boundingRect().height() - drone_visual_height) / 2
-            )  # difference between actual height and visual height
+            - self._drone_visual_height  # visible height of the icon
+            - self._drone_bbox_fudge  # difference between actual and visual height
         )
 
-        self.drone_icon.setPos(x, y)
+        self.drone_icon.setPos(self._icon_x, y)
         self.altitude_number.display(altitude)
 
     def reset(self) -> None:
@@ -299,6 +331,16 @@ class DroneAltitudeWidget(QtWidgets.QWidget):
 
 
 class MovingMapGraphicsView(QtWidgets.QGraphicsView):
+    def __init__(self, scene: QtWidgets.QGraphicsScene) -> None:
+        super().__init__(scene)
+
+        # render the map on the GPU rather than the CPU raster engine.
+        # an OpenGL viewport can't do partial updates, so always repaint all of it
+        self.setViewport(QtOpenGLWidgets.QOpenGLWidget())
+        self.setViewportUpdateMode(
+            QtWidgets.QGraphicsView.ViewportUpdateMode.FullViewportUpdate
+        )
+
     def wheelEvent(self, event: QtGui.QWheelEvent) -> None:
         """
         Override the default scroll event to allow zoom in and out
@@ -339,50 +381,99 @@ class InfiniteGridGraphicsScene(QtWidgets.QGraphicsScene):
     # how many meters between grid line
     LINE_METER_SPACING = 1
 
+    def __init__(self, parent: Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent)
+
+        self._grid_pen = QtGui.QPen(QtGui.QColor(*BLACK_COLOR.rgb_255, 122))
+        self._grid_pen.setWidth(1)
+        # always one device pixel wide, so the grid stays visible at any zoom level
+        self._grid_pen.setCosmetic(True)
+
+        # dashed line causes weird rendering issues when scrolled off the screen
+        # self._grid_pen.setDashPattern([5.0, 5.0])
+
+        self._axis_pen = QtGui.QPen(QtGui.QColor(*BLACK_COLOR.rgb_255, 122))
+        self._axis_pen.setWidth(10)
+
     def drawBackground(
         self, painter: QtGui.QPainter, rect: QtCore.QRectF | QtCore.QRect
     ) -> None:
         """
         Draws a grid within the given viewport.
         """
-        grid_pen = QtGui.QPen(QtGui.QColor(*BLACK_COLOR.rgb_255, 122))
-        grid_pen.setWidth(1)
-
-        # dashed line causes weird rendering issues when scrolled off the screen
-        # grid_pen.setDashPattern([5.0, 5.0])
-
-        painter.setPen(grid_pen)
+        # Qt thinks in a 0,0 is the top-left corner coordinate system.
+        # fetch all four edges in one call, and round them once up front
+        rect_left, rect_top, rect_right, rect_bottom = rect.getCoords()
+        top = math.ceil(rect_top)
+        bottom = math.floor(rect_bottom)
+        left = math.ceil(rect_left)
+        right = math.floor(rect_right)
 
-        # Qt thinks in a 0,0 is the top-left corner coordinate system
+        # only visit the positions that land on a grid line
+        step = self.LINE_METER_SPACING * self.PIXELS_PER_METER
 
         # vertical lines
-        for x in range(
-            math.floor(rect.topLeft().x()), math.ceil(rect.bottomRight().x())
-        ):
-            if x % (self.LINE_METER_SPACING * self.PIXELS_PER_METER) == 0:
-                painter.drawLine(x, math.ceil(rect.top()), x, math.floor(rect.bottom()))
+        x0 = math.ceil(rect_left / step) * step
+        x1 = math.floor(rect_right / step) * step
+        lines = [QtCore.QLineF(x, top, x, bottom) for x in range(x0, x1 + 1, step)]
 
         # horizontal lines
-        for y in range(
-            math.floor(rect.topLeft().y()), math.ceil(rect.bottomRight().y())
-        ):
-            if y % (self.LINE_METER_SPACING * self.PIXELS_PER_METER) == 0:
-                painter.drawLine(math.ceil(rect.left()), y, math.floor(rect.right()), y)
+        y0 = math.ceil(rect_top / step) * step
+        y1 = math.floor(rect_bottom / step) * step
+        lines.extend(QtCore.QLineF(left, y, right, y) for y in range(y0, y1 + 1, step))
+
+        # hand the whole grid to Qt in a single call
+        painter.setPen(self._grid_pen)
+        painter.drawLines(lines)
 
         # draw x=0 and y=0 lines thicker
-        grid_pen.setWidth(10)
-        painter.setPen(grid_pen)
-        painter.drawLine(0, math.ceil(rect.top()), 0, math.floor(rect.bottom()))
-        painter.drawLine(math.ceil(rect.left()), 0, math.floor(rect.right()), 0)
+        painter.setPen(self._axis_pen)
+        painter.drawLines(
+            [QtCore.QLineF(0, top, 0, bottom), QtCore.QLineF(left, 0, right, 0)]
+        )
 
 
 class MovingMapGraphicsWidget(QtWidgets.QWidget):
+    # altitude in meters at which the track color stops changing
+    TRACK_MAX_ALTITUDE = 20
+    # number of distinct track colors between the ground and the max altitude
+    TRACK_COLOR_STEPS = 256
+    # most segments held by a single track path item
+    TRACK_CHUNK_SEGMENTS = 50
+
     def __init__(self, parent: MovingMapWidget) -> None:
         super().__init__(parent)
         self._parent = parent
 
-        # record all trails so they can be cleared
-        self._tracks: list[QtWidgets.QGraphicsLineItem] = []
+        # go from blue to red as the altitude increases
+        # initially was brown to light blue, but was pointed out that
+        # it was hard to distinguish for color blind individuals.
+        # pens are built once up front, indexed by altitude step.
+        # the config colors are resolved once, and smeared on the raw 0-255 values
+        self._alt_min_rgb = ColorConfig.MOVING_MAP_ALTITUDE_MIN_COLOR.rgb_255
+        self._alt_max_rgb = ColorConfig.MOVING_MAP_ALTITUDE_MAX_COLOR.rgb_255
+
+        self._track_pens: list[QtGui.QPen] = []
+        for i in range(self.TRACK_COLOR_STEPS):
+            norm_value = i / (self.TRACK_COLOR_STEPS - 1)
+            rgb = [
+                round(lo + (hi - lo) * norm_value)
+                for lo, hi in zip(self._alt_min_rgb, self._alt_max_rgb)
+            ]
+            track_pen = QtGui.QPen(QtGui.QColor(*rgb, 200))
+            track_pen.setWidth(3)
+            self._track_pens.append(track_pen)
+
+        # record all trails so they can be cleared. Consecutive segments of the
+        # same color share a path item, up to a fixed number of segments, so
+        # extending a path never costs more than copying one chunk.
+        # oldest chunk first, so whole chunks can be trimmed
+        self._track_chunks: deque[QtWidgets.QGraphicsPathItem] = deque()
+        self._track_chunk_lengths: deque[int] = deque()
+        # color step of the newest chunk
+        self._track_chunk_step: Optional[int] = None
+        # total number of segments across all chunks
+        self._track_count = 0
 
         # record drone state
         self.drone_airborne: bool = False
@@ -393,14 +484,24 @@ class MovingMapGraphicsWidget(QtWidgets.QWidget):
         self.setLayout(layout)
 
         self.canvas = InfiniteGridGraphicsScene(self)
+        # tracks are constantly added and removed, and never looked up by position,
+        # so don't pay to keep a BSP tree index up to date
+        self.canvas.setItemIndexMethod(QtWidgets.QGraphicsScene.ItemIndexMethod.NoIndex)
         self.view = MovingMapGraphicsView(self.canvas)
 
+        # scale between meters and scene pixels, and back again
+        self._ppm = float(self.canvas.PIXELS_PER_METER)
+        self._ppm_inv = 1.0 / self._ppm
+
         layout.addWidget(self.view)
 
         # add home icon
         self.home_icon = ResizedQGraphicsSvgItem(
             os.path.join(IMG_DIR, "home_icon.svg"), 50, 50
         )
+        self.home_icon.setCacheMode(
+            QtWidgets.QGraphicsItem.CacheMode.DeviceCoordinateCache
+        )
         self.canvas.addItem(self.home_icon)
         self.home_icon.setPos(
             -self.home_icon.boundingRect().width() / 2,
@@ -426,22 +527,97 @@ class MovingMapGraphicsWidget(QtWidgets.QWidget):
             os.path.join(IMG_DIR, "drone_top_icon.svg"), 80, 80
         )
         self.canvas.addItem(self.drone_icon)
-        self.drone_icon.setPos(
-            -self.drone_icon.boundingRect().width() / 2,
-            -self.drone_icon.boundingRect().height() / 2,
-        )
+
+        # the icon never changes size, so cache the offset from corner to center
+        drone_icon_rect = self.drone_icon.boundingRect()
+        self._drone_half_w = drone_icon_rect.width() / 2
+        self._drone_half_h = drone_icon_rect.height() / 2
+
+        self.drone_icon.setPos(-self._drone_half_w, -self._drone_half_h)
         self.drone_icon.setZValue(999)
 
+        # build the context menus once, only the goto target changes per click
+        self._goto_target = (0.0, 0.0)
+
+        self._goto_action = QtGui.QAction(self)
+        self._goto_action.triggered.connect(self._goto_clicked)  # type: ignore
+
+        land_action = QtGui.QAction("Land at current positon", self)
+        land_action.triggered.connect(  # type: ignore
+            lambda: self._parent.send_message("avr/fcm/action/land")
+        )
+
+        takeoff_action = QtGui.QAction("Takeoff", self)
+        takeoff_action.triggered.connect(  # type: ignore
+            lambda: self._parent.send_message(
+                "avr/fcm/action/takeoff",
+                AVRFCMActionTakeoff(rel_alt=UserConfig.takeoff_height),
+            )
+        )
+
+        self._menu_airborne = QtWidgets.QMenu(self)
+        self._menu_airborne.addAction(self._goto_action)
+        self._menu_airborne.addAction(land_action)
+
+        self._menu_grounded = QtWidgets.QMenu(self)
+        self._menu_grounded.addAction(takeoff_action)
+
         self.follow_drone(True)
 
     def clear_tracks(self) -> None:
         """
         Clear all tracks.
         """
-        for track in self._tracks:
+        for track in self._track_chunks:
             self.canvas.removeItem(track)
 
-        self._tracks = []
+        self._track_chunks.clear()
+        self._track_chunk_lengths.clear()
+        self._track_chunk_step = None
+        self._track_count = 0
+
+    def _add_track(self, color_step: int, segment: QtCore.QLineF) -> None:
+        """
+        Extend the newest track chunk with a new segment, starting a new chunk
+        if the color has changed or the current one is full.
+        """
+        if (
+            not self._track_chunks
+            or color_step != self._track_chunk_step
+            or self._track_chunk_lengths[-1] >= self.TRACK_CHUNK_SEGMENTS
+        ):
+            self._track_chunks.append(
+                self.canvas.addPath(QtGui.QPainterPath(), self._track_pens[color_step])
+            )
+            self._track_chunk_lengths.append(0)
+            self._track_chunk_step = color_step
+
+        track = self._track_chunks[-1]
+        path = track.path()
+        self._extend_track_path(path, segment)
+        track.setPath(path)
+
+        self._track_chunk_lengths[-1] += 1
+        self._track_count += 1
+
+    def _trim_tracks(self) -> None:
+        """
+        Remove the oldest track chunks once over the configured limit.
+        """
+        while self._track_count > UserConfig.max_moving_map_tracks:
+            self.canvas.removeItem(self._track_chunks.popleft())
+            self._track_count -= self._track_chunk_lengths.popleft()
+
+    @staticmethod
+    def _extend_track_path(path: QtGui.QPainterPath, segment: QtCore.QLineF) -> None:
+        """
+        Append a segment to a track path.
+        """
+        # a new chunk has to start at its first point, after that segments
+        # normally carry on from where the last one ended
+        if path.isEmpty() or path.currentPosition() != segment.p1():
+            path.moveTo(segment.p1())
+        path.lineTo(segment.p2())
 
     def follow_drone(self, follow: bool) -> None:
         """
@@ -462,65 +638,45 @@ class MovingMapGraphicsWidget(QtWidgets.QWidget):
         # drone XYZ is NED
         # Qt however consider top left 0, 0
 
-        # current top-left corner of the drone icon
-        current_drone_corner_x = self.drone_icon.x()
-        current_drone_corner_y = self.drone_icon.y()
-
         # current center of the drone icon
-        current_drone_center_x = current_drone_corner_x + (
-            self.drone_icon.boundingRect().width() / 2
-        )
-        current_drone_center_y = current_drone_corner_y + (
-            self.drone_icon.boundingRect().height() / 2
-        )
+        current_drone_center_x = self.drone_icon.x() + self._drone_half_w
+        current_drone_center_y = self.drone_icon.y() + self._drone_half_h
 
         # new center of the drone icon
-        new_drone_center_x = y * self.canvas.PIXELS_PER_METER
-        new_drone_center_y = -x * self.canvas.PIXELS_PER_METER
+        new_drone_center_x = y * self._ppm
+        new_drone_center_y = -x * self._ppm
 
         # new top-left corner of the drone icon
-        new_drone_corner_x = new_drone_center_x - (
-            self.drone_icon.boundingRect().width() / 2
-        )
-        new_drone_corner_y = new_drone_center_y - (
-            self.drone_icon.boundingRect().height() / 2
-        )
+        new_drone_corner_x = new_drone_center_x - self._drone_half_w
+        new_drone_corner_y = new_drone_center_y - self._drone_half_h
 
-        # go from blue to red as the altitude increases
-        # initially was brown to light blue, but was pointed out that
-        # it was hard to distinguish for color blind individuals
-        color = smear_color(
-            ColorConfig.MOVING_MAP_ALTITUDE_MIN_COLOR,
-            ColorConfig.MOVING_MAP_ALTITUDE_MAX_COLOR,
-            value=-z,
-            min_value=0,
-            max_value=20,
+        # pick the pre-built pen for this altitude
+        color_step = round(
+            normalize_value(-z, 0, self.TRACK_MAX_ALTITUDE)
+            * (self.TRACK_COLOR_STEPS - 1)
         )
 
         # draw track
-        track_pen = QtGui.QPen(QtGui.QColor(*color.rgb_255, 200))
-        track_pen.setWidth(3)
-        self._tracks.append(
-            self.canvas.addLine(
+        self._add_track(
+            color_step,
+            QtCore.QLineF(
                 current_drone_center_x,
                 current_drone_center_y,
                 new_drone_center_x,
                 new_drone_center_y,
-                track_pen,
-            )
+            ),
         )
 
         # set limit on the number of tracks that are drawn
         # too high of a limit will cause track removal to slow noticably
-        if len(self._tracks) > UserConfig.max_moving_map_tracks:
-            self.canvas.removeItem(self._tracks.pop(0))
+        self._trim_tracks()
 
         # move icon
         self.drone_icon.setPos(new_drone_corner_x, new_drone_corner_y)
 
         if self._follow_drone:
-            # needed to allow time for GraphicsScene to redraw
-            QtGui.QGuiApplication.processEvents()
+            # centerOn does not need the scene to have been redrawn first, the
+            # normal event loop will repaint the viewport
             self.view.centerOn(self.drone_icon)
 
     def update_drone_attitude(self, yaw: float) -> None:
@@ -533,10 +689,7 @@ class MovingMapGraphicsWidget(QtWidgets.QWidget):
         """
         Reset the drone icon's position and clear the tracks.
         """
-        self.drone_icon.setPos(
-            -self.drone_icon.boundingRect().width() / 2,
-            -self.drone_icon.boundingRect().height() / 2,
-        )
+        self.drone_icon.setPos(-self._drone_half_w, -self._drone_half_h)
         self.drone_icon.setRotation(0)
 
         self.clear_tracks()
@@ -553,48 +706,37 @@ class MovingMapGraphicsWidget(QtWidgets.QWidget):
         # temp_pen.setWidth(3)
         # self.canvas.addEllipse(local_coord.x(), local_coord.y(), 1, 1, temp_pen)
 
-        # invert and then divide by pixels per meter
-        local_coord_n = -local_coord.y() / self.canvas.PIXELS_PER_METER
-        local_coord_e = local_coord.x() / self.canvas.PIXELS_PER_METER
-
-        menu = QtWidgets.QMenu()
+        # invert and then convert from pixels to meters
+        local_coord_n = -local_coord.y() * self._ppm_inv
+        local_coord_e = local_coord.x() * self._ppm_inv
 
         if self.drone_airborne:
-            action1 = QtGui.QAction(
+            self._goto_target = (local_coord_n, local_coord_e)
+            self._goto_action.setText(
                 f"Goto {round(local_coord_n, 1)}, {round(local_coord_e, 1)}"
             )
-            action1.triggered.connect(
-                lambda: self._parent.send_message(
-                    "avr/fcm/action/goto/local",
-                    AVRFCMGoToLocal(
-                        n=local_coord_n,
-                        e=local_coord_e,
-                        d=None,  # use current altitude
-                        hdg=None,  # use vehicle's current heading
-                        relative=False,
-                    ),
-                )
-            )
-            menu.addAction(action1)
-
-            action2 = QtGui.QAction("Land at current positon")
-            action2.triggered.connect(
-                lambda: self._parent.send_message("avr/fcm/action/land")
-            )
-            menu.addAction(action2)
-
+            menu = self._menu_airborne
         else:
-            action3 = QtGui.QAction("Takeoff")
-            action3.triggered.connect(
-                lambda: self._parent.send_message(
-                    "avr/fcm/action/takeoff",
-                    AVRFCMActionTakeoff(rel_alt=UserConfig.takeoff_height),
-                )
-            )
-            menu.addAction(action3)
+            menu = self._menu_grounded
 
         menu.exec_(self.mapToGlobal(event.pos()))
 
+    def _goto_clicked(self) -> None:
+        """
+        Send the drone to the location the context menu was opened at.
+        """
+        local_coord_n, local_coord_e = self._goto_target
+        self._parent.send_message(
+            "avr/fcm/action/goto/local",
+            AVRFCMGoToLocal(
+                n=local_coord_n,
+                e=local_coord_e,
+                d=None,  # use current altitude
+                hdg=None,  # use vehicle's current heading
+                relative=False,
+            ),
+        )
+
 
 class MovingMapWidget(BaseTabWidget):
     def __init__(self, parent: QtWidgets.QWidget) -> None:
@@ -608,6 +750,16 @@ class MovingMapWidget(BaseTabWidget):
 
         self.follow_drone = True
 
+        # telemetry can arrive faster than the display refreshes, so only the
+        # latest messages are kept and drawn at most once per frame
+        self._pending_attitude: Optional[AVRFCMAttitudeEulerDegrees] = None
+        self._pending_position: Optional[AVRFCMPositionLocal] = None
+
+        self._redraw_timer = QtCore.QTimer(self)
+        self._redraw_timer.setSingleShot(True)
+        self._redraw_timer.setInterval(16)
+        self._redraw_timer.timeout.connect(self._flush)  # type: ignore
+
         self.setWindowTitle("Moving Map")
 
     def build(self) -> None:
@@ -659,18 +811,44 @@ class MovingMapWidget(BaseTabWidget):
         """
         Update euler attitude information.
         """
-        self.moving_map_widget.update_drone_attitude(payload.yaw)
-
-        self.attitude_indicator.set_roll(payload.roll)
-        self.attitude_indicator.set_pitch(payload.pitch)
-        self.attitude_indicator.update()
+        self._pending_attitude = payload
+        self._schedule_flush()
 
     def update_position_local(self, payload: AVRFCMPositionLocal) -> None:
         """
-        Update euler attitude information.
+        Update local position information.
+        """
+        self._pending_position = payload
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """
+        Schedule a redraw with the latest telemetry, if one isn't already pending.
+        """
+        if not self._redraw_timer.isActive():
+            self._redraw_timer.start()
+
+    def _flush(self) -> None:
         """
-        self.moving_map_widget.update_drone_position(payload.n, payload.e, payload.d)
-        self.altitude_indicator.set_altitude(payload.d)
+        Push the latest telemetry to the indicators.
+        """
+        attitude = self._pending_attitude
+        position = self._pending_position
+        self._pending_attitude = None
+        self._pending_position = None
+
+        if attitude is not None:
+            self.moving_map_widget.update_drone_attitude(attitude.yaw)
+
+            self.attitude_indicator.set_roll(attitude.roll)
+            self.attitude_indicator.set_pitch(attitude.pitch)
+            self.attitude_indicator.update()
+
+        if position is not None:
+            self.moving_map_widget.update_drone_position(
+                position.n, position.e, position.d
+            )
+            self.altitude_indicator.set_altitude(position.d)
 
     def update_airborne_state(self, payload: AVRFCMAirborne) -> None:
         """
@@ -682,6 +860,11 @@ class MovingMapWidget(BaseTabWidget):
         """
         Reset the widget to a starting state.
         """
+        # drop any telemetry that hasn't been drawn yet
+        self._redraw_timer.stop()
+        self._pending_attitude = None
+        self._pending_position = None
+
         self.attitude_indicator.reset()
         self.moving_map_widget.reset()
         self.altitude_indicator.reset()